@@ -2,7 +2,7 @@
 # flake8: noqa: F401
 # isort: skip_file
 # --- Do not remove these libs ---
-#import numpy as np
+import numpy as np
 #import pandas as pd
 from pandas import DataFrame
 from datetime import datetime
@@ -14,6 +14,8 @@ from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalP
 # --------------------------------
 # Add your lib to import here
 import logging
+import os
+import time
 from freqtrade.constants import Config
 from freqtrade.exchange import timeframe_to_minutes
 from freqtrade.persistence import Order, PairLocks, Trade
@@ -39,6 +41,14 @@ class BaseStrategy(IStrategy):
     # Logger used for specific logging for this strategy
     logger = None
 
+    # Logging level and forced notification for each level accepted by log()
+    _LEVELS = {
+        "INFO": (logging.INFO, False),
+        "DEBUG": (logging.DEBUG, False),
+        "WARNING": (logging.WARNING, True),
+        "ERROR": (logging.ERROR, True),
+    }
+
     # Strategy interface version - allow new iterations of the strategy interface.
     # Check the documentation or the Sample strategy to get the latest version.
     INTERFACE_VERSION = 3
@@ -66,6 +76,9 @@ class BaseStrategy(IStrategy):
     # Minimum profit used for checking exit of trades
     min_profit = 0.0025 # 0.25%
 
+    # Exit reasons for which the minimum profit is checked
+    _EXIT_REASONS_GUARDED = frozenset({'roi', 'stop_loss', 'stoploss_on_exchange', 'trailing_stop_loss', 'exit_signal'})
+
     # Stoploss configuration
     use_custom_stoploss = True
     stoploss_configuration = {}
@@ -111,22 +124,22 @@ class BaseStrategy(IStrategy):
         # Initialize logger
         self.logger = logging.getLogger("freqtrade.strategy")
 
+        # Timestamp at which the next periodic housekeeping should run
+        self._next_housekeep = 0
+
         # Make sure the contents of the Leverage configuration is correct
-        for k, v in self.leverage_configuration.items():
-            self.leverage_configuration[k] = float(v)
+        self.leverage_configuration = {k: float(v) for k, v in self.leverage_configuration.items()}
 
         # Make sure the contents of the Stoploss configuration is correct
-        for k, v in self.stoploss_configuration.items():
-            self.stoploss_configuration[k] = float(v)
-        
-        # Update minimum ROI table keeping leverage into account
+        self.stoploss_configuration = {k: float(v) for k, v in self.stoploss_configuration.items()}
+
+        # Update minimum ROI table keeping leverage into account. Build per instance values
+        # from the class defaults, so repeated construction (hyperopt) doesn't scale them again
         # TODO: improve later on with custom exit with profit and leverage calculation for each pair
         leverage = min(self.leverage_configuration.values()) if len(self.leverage_configuration) > 0 else 1.0
 
-        for k, v in self.minimal_roi.items():
-            self.minimal_roi[k] = round(v * leverage, 4)
-
-        self.stoploss *= leverage
+        self.minimal_roi = {k: round(float(v) * leverage, 4) for k, v in type(self).minimal_roi.items()}
+        self.stoploss = type(self).stoploss * leverage
 
 
     def bot_start(self, **kwargs) -> None:
@@ -159,19 +172,27 @@ class BaseStrategy(IStrategy):
         """
 
         # Run the cleanup of cache once every five minutes
-        if current_time.minute % 5 == 0 and current_time.second <= 10:
+        timestamp = current_time.timestamp()
+        if timestamp >= self._next_housekeep:
             self.cleanup_cache()
+            self._next_housekeep = timestamp + 300
 
         # Check if there are pairs set for which the Auto lock should be reoved
         if len(self.custom_info['remove-autolock']) > 0:
             self.unlock_reason("Auto lock")
 
-            # Sanity check to alert when removing the lock failed
+            # Sanity check to alert when removing the lock failed. Fetch all active locks
+            # at once and keep the longest lock per pair
+            lockeduntil = {}
+            for pl in PairLocks.get_pair_locks(None):
+                if pl.pair not in lockeduntil or pl.lock_end_time > lockeduntil[pl.pair]:
+                    lockeduntil[pl.pair] = pl.lock_end_time
+
             for pair in self.custom_info['remove-autolock']:
-                lock = self.is_locked_until(pair)
+                lock = lockeduntil.get(pair)
                 if lock:
                     self.log(
-                        f"{pair} has still an active lock until {lock}, while it should have been removed!",
+                        f"{pair} has still an active lock until {self.format_lock_time(lock)}, while it should have been removed!",
                         level="ERROR"
                     )
 
@@ -204,8 +225,8 @@ class BaseStrategy(IStrategy):
         :return: DataFrame with entry columns populated
         """
 
-        dataframe.loc[:,'enter_long'] = 0
-        dataframe.loc[:,'enter_short'] = 0
+        dataframe['enter_long'] = np.int8(0)
+        dataframe['enter_short'] = np.int8(0)
 
         return dataframe
 
@@ -218,8 +239,8 @@ class BaseStrategy(IStrategy):
         :return: DataFrame with exit columns populated
         """
 
-        dataframe.loc[:,'exit_long'] = 0
-        dataframe.loc[:,'exit_short'] = 0
+        dataframe['exit_long'] = np.int8(0)
+        dataframe['exit_short'] = np.int8(0)
 
         return dataframe
 
@@ -258,7 +279,7 @@ class BaseStrategy(IStrategy):
 
         # Calculate profit and reject if lower than minimum profit.
         # Allow force_exit and emergency_exit to bypass this check.
-        if exit_reason in ('roi', 'stop_loss', 'stoploss_on_exchange', 'trailing_stop_loss', 'exit_signal'):
+        if exit_reason in self._EXIT_REASONS_GUARDED:
             current_profit = trade.calc_profit_ratio(rate)
             if current_profit <= self.min_profit:
                 confirmed = False
@@ -295,9 +316,8 @@ class BaseStrategy(IStrategy):
         # TODO: monitor what will happen with partially filled 'sell' orders
         if order.ft_order_side == trade.exit_side and not trade.is_open:
             custompairkey = self.get_custom_pairkey(trade.pair, trade.trade_direction)
-            del self.custom_info[custompairkey]
-
-            self.log(f"Removed custom data storage for '{custompairkey}'")
+            if self.custom_info.pop(custompairkey, None) is not None:
+                self.log(f"Removed custom data storage for '{custompairkey}'")
 
         return None
 
@@ -320,7 +340,7 @@ class BaseStrategy(IStrategy):
 
         leverage = 1.0
 
-        pairkey = f"{pair}_{side}"
+        pairkey = self.get_custom_pairkey(pair, side)
         if pairkey in self.leverage_configuration:
             leverage = self.leverage_configuration[pairkey]
         elif "default" in self.leverage_configuration:
@@ -355,7 +375,7 @@ class BaseStrategy(IStrategy):
 
         sl = self.stoploss
 
-        pairkey = f"{pair}_{trade.trade_direction}"
+        pairkey = self.get_custom_pairkey(pair, trade.trade_direction)
         if pairkey in self.stoploss_configuration:
             sl = self.stoploss_configuration[pairkey] * self.leverage_configuration[pairkey]
 
@@ -376,7 +396,8 @@ class BaseStrategy(IStrategy):
             self.log(f"Created custom data storage for pair {pair_key}.")
 
 
-    def get_custom_pairkey(self, pair: str, side: str) -> str:
+    @staticmethod
+    def get_custom_pairkey(pair: str, side: str) -> str:
         """
         Get the custom pairkey used for runtime storage of trade data
 
@@ -388,6 +409,19 @@ class BaseStrategy(IStrategy):
         return f"{pair}_{side}"
 
 
+    @staticmethod
+    def get_cache_key(pair: str, tf: str) -> str:
+        """
+        Get the key used for storing dataframes in the cache
+
+        :param pair: Trading pair
+        :param tf: Timeframe of the dataframe
+        :return str: The composed cache key
+        """
+
+        return f"{pair}_{tf}"
+
+
     def get_round_digits(self, pair: str) -> int:
         """
         Get the number of digits to use for logging purposes based on the pair
@@ -416,20 +450,12 @@ class BaseStrategy(IStrategy):
         :param notify: Indication if a notification should be send
         """
 
+        lvl, force_notify = self._LEVELS.get(level, (logging.INFO, False))
+
         if self.logger:
-            match level:
-                case "INFO":
-                    self.logger.info(message)
-                case "DEBUG":
-                    self.logger.debug(message)
-                case "WARNING":
-                    self.logger.warning(message)
-                    notify = True # Force notification
-                case "ERROR":
-                    self.logger.error(message)
-                    notify = True # Force notification
-
-        if notify:
+            self.logger.log(lvl, message)
+
+        if notify or force_notify:
             self.dp.send_msg(message)
 
 
@@ -447,15 +473,30 @@ class BaseStrategy(IStrategy):
         )
 
 
-    def store_dataframe(self, df: DataFrame, path: str):
+    def store_dataframe(self, df: DataFrame, path: str, fmt="parquet"):
         """
-        Store dataframe to disk on the specified location.
+        Store dataframe to disk on the specified location. The file format is
+        taken from the extension of the path ('.parquet', '.feather' or '.csv'),
+        and falls back to fmt for any other extension.
 
         :param df: Dataframe to be stored
         :param path: Location to store the dataframe
+        :param fmt: File format to use; 'parquet', 'feather' or 'csv'
         """
 
-        df.to_csv(path, index=False, encoding='utf-8')
+        extension = os.path.splitext(path)[1].lower()
+        if extension in (".parquet", ".feather", ".csv"):
+            fmt = extension[1:]
+
+        match fmt:
+            case "parquet":
+                df.to_parquet(path, compression="zstd", index=False)
+            case "feather":
+                df.to_feather(path)
+            case "csv":
+                df.to_csv(path, index=False, encoding='utf-8')
+            case _:
+                raise ValueError(f"Unsupported format '{fmt}' for storing dataframe to {path}")
 
 
     def schedule_remove_autolock(self, pair: str):
@@ -487,32 +528,47 @@ class BaseStrategy(IStrategy):
 
         pl = PairLocks.get_pair_longest_lock(pair)
         if pl is not None:
-            until = pl.lock_end_time.strftime("%Y-%m-%d %H:%M:%S")
+            until = self.format_lock_time(pl.lock_end_time)
 
         return until
 
 
+    def format_lock_time(self, lock_end_time: datetime) -> str:
+        """
+        Format the end time of a pair lock in a readable way
+
+        :param lock_end_time: the end time of the lock
+        :return str: readable date/time
+        """
+
+        return lock_end_time.strftime("%Y-%m-%d %H:%M:%S")
+
+
     def cache_dataframe(self, df: DataFrame, pair: str, tf: str):
         """
         Store (or update) a dataframe for a certain pair and timeframe in the cache.
-        The dataframe is copied to make sure no alternations are made, and the 
-        current time will be stored in order to clean-up things later.
+        A shallow copy of the dataframe is stored, so columns added, removed or
+        renamed later on by the caller (e.g. merge_informative_pair) don't
+        affect the cached data, without copying the underlying buffers. A deadline
+        (timeframe plus a margin of two minutes) will be stored in order to
+        clean-up things later.
 
         :param df: Dataframe to store
         :param pair: Pair the Dataframe belongs to
         :param tf: Timeframe the Dataframe belongs to
         """
 
-        key = f"{pair}_{tf}"
+        key = self.get_cache_key(pair, tf)
         if not key in self.custom_info['cache']:
             # Create empty entry for this trade
             self.custom_info['cache'][key] = {}
             self.custom_info['cache'][key]['tf'] = tf
+            self.custom_info['cache'][key]['lifetime'] = (timeframe_to_minutes(tf) + 2) * 60
 
             self.log(f"Created custom cache storage for {key}.")
 
-        self.custom_info['cache'][key]['df'] = df.copy()
-        self.custom_info['cache'][key]['datetime'] = datetime.now()
+        self.custom_info['cache'][key]['df'] = df.copy(deep=False)
+        self.custom_info['cache'][key]['deadline'] = time.monotonic() + self.custom_info['cache'][key]['lifetime']
 
 
     def get_dataframe_from_cache(self, pair: str, tf: str) -> DataFrame:
@@ -524,7 +580,7 @@ class BaseStrategy(IStrategy):
         :return DataFrame: Dataframe for the pair and specified timeframe, or None of not found
         """
 
-        key = f"{pair}_{tf}"
+        key = self.get_cache_key(pair, tf)
         if key in self.custom_info['cache']:
             return self.custom_info['cache'][key]['df']
 
@@ -541,17 +597,7 @@ class BaseStrategy(IStrategy):
         :return bool: True if the last candle doesn't match, otherwise False        
         """
 
-        refresh = False
-        if old_df is None:
-            refresh = True
-        else:
-            last_old_candle = old_df.iloc[-1].squeeze()
-            last_new_candle = new_df.iloc[-1].squeeze()
-
-            if last_old_candle['date'] != last_new_candle['date']:
-                refresh = True
-
-        return refresh
+        return old_df is None or old_df['date'].iat[-1] != new_df['date'].iat[-1]
 
 
     def cleanup_cache(self):
@@ -559,16 +605,11 @@ class BaseStrategy(IStrategy):
         Cleanup the cache with stored dataframes if the last updated time has passed (with a margin of two minutes).
         """
 
-        outdatedkeys = []
-
-        currentdatetime = datetime.now()
-        for key in self.custom_info['cache']:
-            minutes = (currentdatetime - self.custom_info['cache'][key]['datetime']).total_seconds() / 60
-            
-            if (minutes - 2) > timeframe_to_minutes(self.custom_info['cache'][key]['tf']):
-                outdatedkeys.append(key)
+        cache = self.custom_info['cache']
 
-                self.log(f"Removing cache storage for '{key}' because last update was {minutes} minutes ago")
+        now = time.monotonic()
+        outdatedkeys = [key for key, entry in cache.items() if now > entry['deadline']]
 
         for key in outdatedkeys:
-            del self.custom_info['cache'][key]
\ No newline at end of file
+            self.log(f"Removing cache storage for '{key}' because it was not updated within its timeframe")
+            cache.pop(key, None)
\ No newline at end of file
@@ -246,7 +246,7 @@ class DCAStrategy(BaseStrategy):
 
         # When Safety Orders are enabled, check the configuration. The specific pair should be in the configuration, or
         # the default entry must be present. If this is not the case, don't open a new trade to avoid issues later on.
-        pairkey = f"{pair}_{side}"
+        pairkey = self.get_custom_pairkey(pair, side)
         if self.max_entry_position_adjustment > 0:
             if pairkey not in self.safety_order_configuration and "default" not in self.safety_order_configuration:
                 self.log(
@@ -386,9 +386,9 @@ class DCAStrategy(BaseStrategy):
         count_of_entries = trade.nr_of_successful_entries
         count_of_safety_orders = count_of_entries - 1 # Subtract Base Order
         if count_of_safety_orders >= self.safety_order_configuration[configpairkey]["max_so"]:
-            self.log(
-                f"{trade.pair}: reached max number ({self.safety_order_configuration[configpairkey]['max_so']}) of Safety Orders.",
-                "DEBUG"
+            self.logger.debug(
+                "%s: reached max number (%s) of Safety Orders.",
+                trade.pair, self.safety_order_configuration[configpairkey]['max_so']
             )
             return None
 
@@ -453,9 +453,9 @@ class DCAStrategy(BaseStrategy):
                 return None
             # Return when profit has not increased, and is still below the thresold value to place a new Safety Order
             elif current_entry_profit_percentage < self.custom_info[custompairkey]["add_safety_order_on_profit_percentage"]:
-                self.log(
-                    f"{trade.pair}: profit {current_entry_profit_percentage:.4f}% still below threshold of {self.custom_info[custompairkey]['add_safety_order_on_profit_percentage']:.4f}%.",
-                    "DEBUG"
+                self.logger.debug(
+                    "%s: profit %.4f%% still below threshold of %.4f%%.",
+                    trade.pair, current_entry_profit_percentage, self.custom_info[custompairkey]['add_safety_order_on_profit_percentage']
                 )
                 return None
             # Else case: trailing passed the threshold and additional order can be placed